@@ -77,15 +77,23 @@ See also:
 * EIA Electricity Data (https://www.eia.gov/electricity/data.php)
 """
 
+from __future__ import annotations
 import os
 import sys
+import functools
+import inspect
+import urllib.request
 from typing import TypeVar as _TYPEVAR
 import datetime as dt
-import pandas as pd
 
 E_OK = 0
 E_ERROR =1
 
+SEPARATOR = "\x1f" # column level separator used in the parquet cache
+
+# pylint: disable-next=C0103
+pd = None # pandas is imported when data is first loaded
+
 def main(argv:list[str]=sys.argv[1:]) -> int:
     """Main CLI
 
@@ -106,7 +114,7 @@ def main(argv:list[str]=sys.argv[1:]) -> int:
         RetailError: exception raised when an invalid command argument is encountered.
     """
 
-    main.DATA = RetailElectricity()
+    main.DATA = None
     main.DEBUG = False
     main.YEAR = None
     main.MONTH = None
@@ -151,6 +159,88 @@ def main(argv:list[str]=sys.argv[1:]) -> int:
 class RetailError(Exception):
     """Retail electricity data exception"""
 
+def _download(url:str,workbook:str,timeout:float):
+    """Download the retail electricity data workbook
+
+    Arguments:
+
+        url (str): URL from which the data workbook is downloaded
+
+        workbook (str): name of the file in which the workbook is saved verbatim
+
+        timeout (float): download timeout in seconds
+    """
+    with urllib.request.urlopen(url,timeout=timeout) as response:
+        raw = response.read()
+    with open(workbook,"wb") as fh:
+        fh.write(raw)
+
+def _convert(workbook:str,cache:str):
+    """Convert the retail electricity data workbook to the cache
+
+    Arguments:
+
+        workbook (str): name of the downloaded workbook file
+
+        cache (str): name of the parquet cache file
+    """
+    try:
+        # pylint: disable-next=C0415,W0611
+        import python_calamine
+        # pandas supports the calamine engine since version 2.2
+        calamine = tuple(int(x) for x in pd.__version__.split(".")[:2]) >= (2,2)
+    except ImportError:
+        calamine = False
+    try:
+        data = pd.read_excel(workbook,
+            engine="calamine" if calamine else "openpyxl",
+            header=[0,1,2],
+            index_col=[0,1,2],
+            skipfooter=1,
+            )
+    except:
+        os.remove(workbook) # a bad download must not block the next one
+        raise
+    data.index.names = ["Year","Month","State"]
+    data.columns.names = ["Sector","Value","Unit"]
+    data = data.loc[:,~data.columns.to_frame(index=False)
+        .eq("Data Status").any(axis=1).to_numpy()]
+    data.sort_index(inplace=True)
+    data.index = data.index.set_levels(data.index.levels[2].astype("category"),level=2)
+    data.columns = [SEPARATOR.join(x) for x in data.columns]
+    temp = cache + ".tmp" # keep the stale cache until the new one is complete
+    try:
+        data.to_parquet(temp,compression="zstd")
+        os.replace(temp,cache)
+    except:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+@functools.lru_cache(maxsize=4)
+# pylint: disable-next=W0613
+def _load(cache:str,mtime:float) -> pd.DataFrame:
+    """Load retail electricity data from the cache
+
+    Arguments:
+
+        cache (str): name of the parquet cache file
+
+        mtime (float): modification time of the cache file
+
+    Returns:
+
+        pd.DataFrame: retail electricity data
+    """
+    data = pd.read_parquet(cache)
+    # levels are kept in workbook order so the columns are lexsorted as is
+    codes,levels = zip(*[pd.factorize(pd.Index(x))
+        for x in zip(*[x.split(SEPARATOR) for x in data.columns])])
+    data.columns = pd.MultiIndex(codes=codes,
+        levels=[levels[0].astype("category"),levels[1],levels[2].astype("category")],
+        names=["Sector","Value","Unit"])
+    return data
+
 class RetailElectricity:
     """Retail electricity data class
 
@@ -194,10 +284,15 @@ class RetailElectricity:
     To get a list of available values, use
 
       data.key(KEY_VALUE)    
+
+    The distinct keys are also available as the properties `years`,
+    `months`, `states`, `sectors`, and `values`, e.g.,
+
+      data.sectors
     """
     url = "https://www.eia.gov/electricity/data/eia861m/xls/sales_revenue.xlsx"
     refresh = 86400 # refresh every day
-    cache = None
+    timeout = 60 # download timeout in seconds
 
     def __init__(self:_TYPEVAR("RetailElectricity"),url:str=None):
         """Class constructor 
@@ -209,39 +304,40 @@ class RetailElectricity:
         if url:
             self.url = url
 
-        cache = os.path.basename(self.url)
-        expires = dt.datetime.now() - dt.timedelta(seconds=self.refresh)
-        if self.cache is None \
-                or dt.datetime.fromtimestamp(os.path.getctime(cache)) < expires:
-            if not os.path.exists(cache):
-                file = self.url
-            else:
-                file = cache
-            self.cache = pd.read_excel(file,
-                header=[0,1,2],
-                index_col=[0,1,2],
-                skipfooter=1 if file == self.url else 0,
-                ).sort_index()
-            if file != cache:
-                try:
-                    self.cache.to_excel(cache)
-                except:
-                    os.remove(cache)
+        # pylint: disable-next=W0603
+        global pd
+        if pd is None:
+            # pylint: disable-next=C0415
+            import pandas as pd
+
+        name,ext = os.path.splitext(os.path.basename(self.url))
+        workbook = name + ".download" + ext # not the name older versions cached to
+        cache = name + ".parquet"
+        if self._expired(cache):
+            try:
+                if self._expired(workbook):
+                    _download(self.url,workbook,self.timeout)
+                _convert(workbook,cache)
+            # pylint: disable-next=W0718
+            except Exception:
+                if not os.path.exists(cache):
                     raise
-            self.cache.index.names = ["Year","Month","State"]
-            self.cache.columns.names = ["Sector","Value","Unit"]
-            self.cache.drop([x for x in self.cache.columns
-                if 'Data Status' in x],axis=1,inplace=True)
-        self.data = self.cache.copy()
+                e_type,e_value,_ = sys.exc_info()
+                print(f"WARNING [retail/{os.path.basename(sys.argv[0])}:{e_type.__name__}]:" +
+                    f" {e_value} (using cached data in '{cache}')",file=sys.stderr,flush=True)
+        self.data = _load(cache,os.path.getmtime(cache)) # shared, do not change in place
+
+    def _expired(self:_TYPEVAR("RetailElectricity"),file:str) -> bool:
+        """Check whether a cached file is missing or older than `refresh`"""
+        return not os.path.exists(file) or dt.datetime.fromtimestamp(os.path.getmtime(file)) \
+            < dt.datetime.now() - dt.timedelta(seconds=self.refresh)
 
     def __getitem__(self:_TYPEVAR("RetailElectricity"),index):
         if isinstance(index,int) or len(index) <= 3:
             return self.data.loc[index]
-        if len(index) == 4:
-            return self.data.loc[index[:3]][index[3]]
-        if len(index) == 5:
-            return self.data.loc[index[:3]][index[3]][index[4]]
-        raise KeyError("too many indexers")
+        if len(index) > 5:
+            raise KeyError("too many indexers")
+        return self.data.loc[index[:3],index[3:]]
 
     def keys(self:_TYPEVAR("RetailElectricity"),key:str=None,unique:bool=False) -> set|list:
         """Get keys used for indexing data
@@ -259,16 +355,12 @@ class RetailElectricity:
         """
         if key is None:
             return {"rows":list(self.data.index),"columns":list(self.data.columns)}
-        if key in self.data.index.names:
-            values = self.data.reset_index()[key]
-        elif key in self.data.columns.names:
-            column = [n for n,x in enumerate(self.data.columns.names) if x==key]
-            if column == []:
-                raise RetailError(f"{key} is not valid")
-            values = [x[column[0]] for x in self.data.columns]
-        else:
-            raise KeyError(f"invalid key = {key}")
-        return set(values) if unique else list(values)
+        for axis in [self.data.index,self.data.columns]:
+            if key in axis.names:
+                if unique:
+                    return set(axis.unique(level=key).tolist())
+                return axis.get_level_values(key).tolist()
+        raise KeyError(f"invalid key = {key}")
 
     def units(self) -> dict:
         """Get units of data
@@ -278,7 +370,33 @@ class RetailElectricity:
             dict: mapping of value keys to units of values
 
         """
-        return {x[1]:x[2] for x in self.data.columns[1:]}
+        return dict(zip(self.data.columns.get_level_values(1)[1:],
+            self.data.columns.get_level_values(2)[1:]))
+
+    @functools.cached_property
+    def years(self) -> frozenset:
+        """Distinct years in the data"""
+        return frozenset(self.keys(KEY_YEAR,True))
+
+    @functools.cached_property
+    def months(self) -> frozenset:
+        """Distinct months in the data"""
+        return frozenset(self.keys(KEY_MONTH,True))
+
+    @functools.cached_property
+    def states(self) -> frozenset:
+        """Distinct states in the data"""
+        return frozenset(self.keys(KEY_STATE,True))
+
+    @functools.cached_property
+    def sectors(self) -> frozenset:
+        """Distinct sectors in the data"""
+        return frozenset(self.keys(KEY_SECTOR,True))
+
+    @functools.cached_property
+    def values(self) -> frozenset:
+        """Distinct values in the data"""
+        return frozenset(self.keys(KEY_VALUE,True))
 
 KEY_YEAR = "Year"
 KEY_MONTH = "Month"
@@ -286,30 +404,38 @@ KEY_STATE = "State"
 KEY_SECTOR = "Sector"
 KEY_VALUE = "Value"
 
+_KEY_NAMES = [y for x,y in globals().items() if x.startswith("KEY_")]
+
+_EXPECTED_MONTHS = frozenset(range(1,13))
+_EXPECTED_STATES = frozenset({
+    'DC', 'FL', 'OK', 'KY', 'MI', 'TN', 'WA', 'SC', 'CT', 'NV', 'IA', 'CA', 
+    'DE', 'GA', 'AK', 'NY', 'SD', 'AR', 'UT', 'MA', 'NC', 'NJ', 'OH', 'ND', 
+    'RI', 'CO', 'IN', 'MT', 'WV', 'WY', 'NH', 'AL', 'VT', 'OR', 'NM', 'VA', 
+    'MS', 'IL', 'AZ', 'HI', 'WI', 'MN', 'MO', 'MD', 'LA', 'KS', 'PA', 'NE', 
+    'TX', 'ID', 'ME'})
+_EXPECTED_SECTORS = frozenset({
+    'TOTAL', 'INDUSTRIAL', 'RESIDENTIAL', 'TRANSPORTATION', 'COMMERCIAL'
+    })
+_EXPECTED_VALUES = frozenset({'Customers', 'Sales', 'Price', 'Revenue'})
+_EXPECTED_UNITS = {
+    'Revenue': 'Thousand Dollars', 
+    'Sales': 'Megawatthours', 
+    'Customers': 'Count', 
+    'Price': 'Cents/kWh',
+    }
+
 def _validate():
 
     data = RetailElectricity()
 
     main.DEBUG = True
 
-    assert min(data.keys(KEY_YEAR,True))==2010
-    assert data.keys(KEY_MONTH,True)==set(range(1,13))
-    assert data.keys(KEY_STATE,True)=={
-        'DC', 'FL', 'OK', 'KY', 'MI', 'TN', 'WA', 'SC', 'CT', 'NV', 'IA', 'CA', 
-        'DE', 'GA', 'AK', 'NY', 'SD', 'AR', 'UT', 'MA', 'NC', 'NJ', 'OH', 'ND', 
-        'RI', 'CO', 'IN', 'MT', 'WV', 'WY', 'NH', 'AL', 'VT', 'OR', 'NM', 'VA', 
-        'MS', 'IL', 'AZ', 'HI', 'WI', 'MN', 'MO', 'MD', 'LA', 'KS', 'PA', 'NE', 
-        'TX', 'ID', 'ME'}
-    assert data.keys(KEY_SECTOR,True)=={
-        'TOTAL', 'INDUSTRIAL', 'RESIDENTIAL', 'TRANSPORTATION', 'COMMERCIAL'
-        }
-    assert data.keys(KEY_VALUE,True)=={'Customers', 'Sales', 'Price', 'Revenue'}
-    assert data.units()=={
-        'Revenue': 'Thousand Dollars', 
-        'Sales': 'Megawatthours', 
-        'Customers': 'Count', 
-        'Price': 'Cents/kWh',
-        }
+    assert min(data.years)==2010
+    assert data.months==_EXPECTED_MONTHS
+    assert data.states==_EXPECTED_STATES
+    assert data.sectors==_EXPECTED_SECTORS
+    assert data.values==_EXPECTED_VALUES
+    assert data.units()==_EXPECTED_UNITS
 
     assert len(data[2020])==612
     assert len(data[(2020)])==612
@@ -328,181 +454,225 @@ def _validate():
     """.split("\n"):
             main(test.split())
     except:
-        for file in ["keys.txt","test.csv","test.xlsx","test.json","sales_revenue.xlsx"]:
+        for file in ["keys.txt","test.csv","test.xlsx","test.json",
+                "sales_revenue.download.xlsx","sales_revenue.parquet"]:
             if os.path.exists(file):
                 os.remove(file)
         raise
 
-# pylint: disable-next=R0914,R0912,R0915
-def _main(argv:list[str]) -> int:
-
-    if len(argv) == 0:
-
-        print([x for x in __doc__.split("\n") if x.startswith("Syntax: ")][0],file=sys.stderr)
-        return E_OK
-
-    if argv[0] in ["-h","--help","help"]:
-
-        print(__doc__,file=main.OUTPUT if main.OUTPUT else sys.stdout)
-        return E_ERROR
-
-    data = main.DATA.data
-
-    for arg in argv:
-        key,value = arg.split("=",1) if "=" in arg else (arg,None)
-
-        if arg == "--debug":
+def _writable(data:pd.DataFrame) -> pd.DataFrame:
+    """Copy the shared data before its axes are changed in place"""
+    return data.copy(deep=False) if data is main.DATA.data else data
 
-            main.DEBUG = True
+def _pack(index:pd.Index) -> pd.Index:
+    """Pack index levels into colon-delimited strings
 
-        elif arg == "--validate":
+    Arguments:
 
-            _validate()
-            return E_OK
+        index (pd.Index): the (multi-level) index to pack
 
-        elif key == "--select":
-
-            astype = {
-                "Year" : int,
-                "Month" : int,
-                "State" : str,
-            }
-            select = {x:astype[x](y) for x,y in [z.split(':',1) for z in value.split(",")]}
-            data.reset_index(inplace=True)
-            data.set_index(list(select.keys()),inplace=True)
-            data.sort_index(inplace=True)
-            result = data.loc[tuple(select.values())]
-            if isinstance(result,pd.Series):
-                data = data.loc[[list(select.values())]]
-            else:
-                data = result
-
-        elif key == "--index":
-
-            main.INDEX = True if not value else value
-            if value.lower() == "none":
-                main.INDEX = False
-            elif value.lower() == "unpack":
-                main.INDEX = True
-
-        elif key == "--group":
-
-            for group,aggregate in [x.split(':',1) for x in value.split(",")]:
-                data = data.groupby(group)
-                data = getattr(data,aggregate)()
-
-        elif key == "--header":
-
-            if value == "pack":
-                main.HEADER = "pack"
-            elif value == "unpack":
-                main.HEADER = True
-            elif value == "none":
-                main.HEADER = False
-            main.HEADER=True if not value else value
-
-        elif key == "--stdout":
-
-            args = []
-            kwargs = {}
-            for arg in [x.split(":",2) for x in value.split(",")]:
-                if len(arg) == 2:
-                    kwargs[arg[0]] = arg[1]
-                else:
-                    args.append(arg[0])
-            if "encoding" not in kwargs:
-                kwargs["encoding"] = main.ENCODING
-            # pylint: disable-next=W1514,R1732
-            sys.stdout = open(*args,**kwargs)
-
-        elif key == "--stderr":
-
-            args = []
-            kwargs = {}
-            for arg in [x.split(":",2) for x in value.split(",")]:
-                if len(arg) == 2:
-                    kwargs[arg[0]] = arg[1]
-                else:
-                    args.append(arg[0])
-            if "encoding" not in kwargs:
-                kwargs["encoding"] = main.ENCODING
-            # pylint: disable-next=W1514,R1732
-            sys.stderr = open(*args,**kwargs)
-
-        elif key == "--keys":
-
-            valid = [globals()[x] for x in globals() if x.startswith("KEY_")]
-            for k in ( value.split(",") if value else valid ):
-                if k in valid:
-                    vals = ",".join(sorted([str(x) for x in main.DATA.keys(k,unique=True)]))
-                    print(f"{k}={vals}" if value is None or "," in value else vals,
-                        file=main.OUTPUT if main.OUTPUT else sys.stdout,
-                        **main.OPTIONS["kwargs"])
-                else:
-                    raise RetailError(f"key {k} not found in indexes")
+    Returns:
 
-            sys.exit(E_OK)
+        pd.Index: the packed index values, omitting empty level values
+    """
+    if not isinstance(index,pd.MultiIndex):
+        return index.astype(str)
+    packed = None
+    empty = False
+    for level,codes in zip(index.levels,index.codes):
+        # format each distinct level value once and gather them by code
+        # (the code -1 of a missing value picks the trailing "nan")
+        values = level.astype(str).append(pd.Index(["nan"]))
+        empty |= "" in values
+        values = values.take(codes)
+        packed = values if packed is None else packed + ":" + values
+    if empty:
+        packed = packed.str.replace(":{2,}",":",regex=True).str.strip(":")
+    return packed
+
+@functools.cache
+def _valid_formats() -> frozenset:
+    return frozenset(x[3:] for x in dir(pd.DataFrame) if x.startswith("to_"))
+
+# pylint: disable-next=W0613
+def _debug(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    main.DEBUG = True
+    return data
+
+# pylint: disable-next=W0613
+def _validate_option(data:pd.DataFrame,value:str) -> None:
+    _validate()
+
+def _select(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    astype = {
+        "Year" : int,
+        "Month" : int,
+        "State" : str,
+    }
+    select = {x:astype[x](y) for x,y in [z.split(':',1) for z in value.split(",")]}
+    data = data.xs(tuple(select.values()),level=list(select),drop_level=False)
+    return data.reorder_levels(list(select)
+        + [x for x in data.index.names if x not in select])
+
+def _index(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    main.INDEX = True if not value else value
+    if value.lower() == "none":
+        main.INDEX = False
+    elif value.lower() == "unpack":
+        main.INDEX = True
+    return data
+
+def _group(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    for group,aggregate in [x.split(':',1) for x in value.split(",")]:
+        data = data.groupby(group,observed=True)
+        data = getattr(data,aggregate)()
+    return data
+
+def _header(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    if value == "pack":
+        main.HEADER = "pack"
+    elif value == "unpack":
+        main.HEADER = True
+    elif value == "none":
+        main.HEADER = False
+    main.HEADER=True if not value else value
+    return data
+
+def _open(value:str):
+    args = []
+    kwargs = {}
+    for arg in [x.split(":",2) for x in value.split(",")]:
+        if len(arg) == 2:
+            kwargs[arg[0]] = arg[1]
+        else:
+            args.append(arg[0])
+    if "encoding" not in kwargs:
+        kwargs["encoding"] = main.ENCODING
+    # pylint: disable-next=W1514
+    return open(*args,**kwargs)
+
+def _stdout(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    sys.stdout = _open(value)
+    return data
+
+def _stderr(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    sys.stderr = _open(value)
+    return data
+
+# pylint: disable-next=W0613
+def _keys(data:pd.DataFrame,value:str) -> None:
+    for k in ( value.split(",") if value else _KEY_NAMES ):
+        if k in _KEY_NAMES:
+            vals = ",".join(sorted([str(x) for x in main.DATA.keys(k,unique=True)]))
+            print(f"{k}={vals}" if value is None or "," in value else vals,
+                file=main.OUTPUT if main.OUTPUT else sys.stdout,
+                **main.OPTIONS["kwargs"])
+        else:
+            raise RetailError(f"key {k} not found in indexes")
 
-        elif key == "--format":
+    sys.exit(E_OK)
 
-            if not value:
-                main.FORMAT = "csv"
-            elif not value in [x[3:] for x in dir(pd.DataFrame) if x.startswith("to_")]:
-                raise RetailError(f"{value} is not a valid output format")
-            else:
-                main.FORMAT = value
+def _format(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    if not value:
+        main.FORMAT = "csv"
+    elif not value in _valid_formats():
+        raise RetailError(f"{value} is not a valid output format")
+    else:
+        main.FORMAT = value
+    return data
 
-        elif key == "--precision":
+def _precision(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    main.PRECISION = None if value is None else int(value)
+    return data
 
-            main.PRECISION = None if value is None else int(value)
+def _units(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    if len(data.index.names) < 3:
 
-        elif key == "--units":
+        raise RetailError("--units must be specified first")
 
-            if len(data.index.names) < 3:
+    if main.UNITS:
 
-                raise RetailError("--units must be specified first")
+        raise RetailError("--units have already been specified")
 
-            if main.UNITS:
+    if value == "glm":
 
-                raise RetailError("--units have already been specified")
+        lookup = {
+            'Revenue': '$k', 
+            'Sales': 'MWh', 
+            'Customers': 'unit', 
+            'Price': '0.01$/kWh',
+        }
+        data = data.assign(**lookup)
+        values = data.columns.get_level_values(1)
+        units = values.map(lookup)
+        data.columns = pd.MultiIndex.from_arrays([data.columns.get_level_values(0),
+            values,units.where(units.notna(),data.columns.get_level_values(2))],
+            names=data.columns.names)
+        main.INDEX = "pack"
+        main.UNITS = "glm"
+
+    return data
+
+def _output(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    for arg in [x.split(":",2) for x in value.split(",")]:
+        if len(arg) == 2:
+            main.OPTIONS["kwargs"][arg[0]] = arg[1]
+        else:
+            main.OPTIONS["args"].append(arg[0])
+    main.OUTPUT = main.OPTIONS["args"][0]
+    main.FORMAT = os.path.splitext(main.OUTPUT)[1].split(".")[-1]
+    return data
+
+# pylint: disable-next=W0613
+def _none(data:pd.DataFrame,value:str) -> pd.DataFrame:
+    return data
+
+# command option handlers, which return the updated data or None when done
+_HANDLERS = {
+    "-": _none,
+    "--debug": _debug,
+    "--validate": _validate_option,
+    "--select": _select,
+    "--index": _index,
+    "--group": _group,
+    "--header": _header,
+    "--stdout": _stdout,
+    "--stderr": _stderr,
+    "--keys": _keys,
+    "--format": _format,
+    "--precision": _precision,
+    "--units": _units,
+    "-o": _output,
+    "--output": _output,
+}
+
+# pylint: disable-next=R0912,R0915
+def _main(argv:list[str]) -> int:
 
-            if value == "glm":
+    if len(argv) == 0:
 
-                lookup = {
-                    'Revenue': '$k', 
-                    'Sales': 'MWh', 
-                    'Customers': 'unit', 
-                    'Price': '0.01$/kWh',
-                }
-                columns = list(data.columns)
-                for n,values in enumerate(columns):
-                    values = list(values)
-                    if values[1] in lookup:
-                        values[2] = lookup[values[1]]
-                    columns[n] = tuple(values)
-                data.columns = pd.MultiIndex.from_tuples(columns)
-                for column,unit in lookup.items():
-                    data.loc[data.index,column] = unit
-                main.INDEX = "pack"
-                main.UNITS = "glm"
+        print([x for x in __doc__.split("\n") if x.startswith("Syntax: ")][0],file=sys.stderr)
+        return E_OK
 
-        elif key in ["-o","--output"]:
+    if argv[0] in ["-h","--help","help"]:
 
-            for arg in [x.split(":",2) for x in value.split(",")]:
-                if len(arg) == 2:
-                    main.OPTIONS["kwargs"][arg[0]] = arg[1]
-                else:
-                    main.OPTIONS["args"].append(arg[0])
-            main.OUTPUT = main.OPTIONS["args"][0]
-            main.FORMAT = os.path.splitext(main.OUTPUT)[1].split(".")[-1]
+        print(__doc__,file=main.OUTPUT if main.OUTPUT else sys.stdout)
+        return E_ERROR
 
-        elif arg != "-":
+    main.DATA = RetailElectricity()
+    data = main.DATA.data # copy with _writable() before changing axes in place
 
+    for arg in argv:
+        key,value = arg.split("=",1) if "=" in arg else (arg,None)
+        if key not in _HANDLERS:
             raise RetailError(f"invalid option '{arg}'")
+        data = _HANDLERS[key](data,value)
+        if data is None:
+            return E_OK
 
     if main.HEADER == "pack":
-        pack = [":".join([y for y in x if y]) for x in data.columns]
-        data.columns.droplevel([1,2])
+        data = _writable(data)
+        pack = _pack(data.columns).tolist()
         drop = []
         if main.UNITS == "glm":
             for n,item in enumerate(pack):
@@ -517,16 +687,16 @@ def _main(argv:list[str]) -> int:
             data = data.drop(item,axis=1)
 
     if main.INDEX == "pack":
-        name = ":".join(data.index.names)
-        data.loc[name] = [":".join([str(y) for y in x if x]) for x in data.index]
-        data.set_index(name,inplace=True)
+        data = _writable(data)
+        data.index = _pack(data.index).rename(":".join(data.index.names))
     elif not main.INDEX:
+        data = _writable(data)
         data.reset_index(inplace=True)
 
     if not main.PRECISION is None:
         data = data.round(main.PRECISION)
 
-    if main.FORMAT in [x[3:] for x in dir(data) if x.startswith("to_")]:
+    if main.FORMAT in _valid_formats():
 
         call = getattr(data,f"to_{main.FORMAT}")
         def bool_t(x):
@@ -548,14 +718,19 @@ def _main(argv:list[str]) -> int:
                     # pylint: disable-next=W0702
                     except:
                         continue
+        if not main.OPTIONS["args"] and next(iter(inspect.signature(call).parameters)) \
+                in ["buf","path_or_buf","path_or_buffer"]:
+            main.OPTIONS["args"].append(sys.stdout) # stream text output to stdout
+            if "lineterminator" in inspect.signature(call).parameters:
+                # text streams already translate newlines
+                main.OPTIONS["kwargs"].setdefault("lineterminator","\n")
         call(*main.OPTIONS["args"],**main.OPTIONS["kwargs"])
 
     elif main.FORMAT is None:
 
-        pd.options.display.width = None
-        pd.options.display.max_rows = None
-        pd.options.display.max_columns = None
-        print(data,file=main.OUTPUT if main.OUTPUT else sys.stdout)
+        output = main.OUTPUT if main.OUTPUT else sys.stdout
+        data.to_string(buf=output,max_rows=None,max_cols=None)
+        print(file=output)
 
     else:
 